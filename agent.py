@@ -8,19 +8,57 @@ Similar to spec-engine/agent.py, this creates a graph from a test definition
 for development purposes.
 """
 
-import sys
+import copy
+import functools
+import logging
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from core.builder import GraphBuilder
+from tests.utils.test_helpers import load_definition_with_files
 
-# Add tests directory to path to import test helpers
-tests_dir = Path(__file__).parent / "tests"
-sys.path.insert(0, str(tests_dir))
+# Resolved once at import; the factory may be invoked per LangGraph CLI session
+_DEFINITION_PATH = (Path(__file__).parent / "tests" / "mock" / "definition.json").resolve()
 
-from integration.test_helpers import load_definition_with_files
+logger = logging.getLogger(__name__)
+
+# Compiled graphs keyed by id(checkpointer). Each entry keeps the checkpointer
+# it was built with (so the id cannot be recycled while cached) and the
+# definition mtime it was built from.
+_AGENT_CACHE_SIZE = 8
+_agent_cache: Dict[int, Tuple[Optional[BaseCheckpointSaver], int, Any]] = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _load_definition_cached(path_str: str, mtime_ns: int) -> Mapping[str, Any]:
+    """
+    Load a definition once per (path, mtime) pair.
+
+    The mtime is part of the cache key so edits to definition.json invalidate
+    the entry. Prompt/tool file edits alone do not change it; touch
+    definition.json to force a reload.
+    """
+    return MappingProxyType(load_definition_with_files(Path(path_str)))
+
+
+def _definition_mtime_ns(definition_path: Path) -> int:
+    """Return the definition's mtime, raising a descriptive error if it is missing."""
+    try:
+        return definition_path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"Test definition not found at {definition_path}. "
+            "Please ensure tests/mock/definition.json exists."
+        ) from None
+
+
+def _load_definition(definition_path: Path, mtime_ns: int) -> Dict[str, Any]:
+    """Return a private copy of the cached definition for the given path."""
+    cached = _load_definition_cached(str(definition_path), mtime_ns)
+    return copy.deepcopy(dict(cached))
 
 
 def create_deepagents_runtime(checkpointer: Optional[BaseCheckpointSaver] = None):
@@ -38,27 +76,34 @@ def create_deepagents_runtime(checkpointer: Optional[BaseCheckpointSaver] = None
     Returns:
         Compiled agent graph ready for execution
     """
-    print("🚀 create_deepagents_runtime called!")
-    print(f"📦 Checkpointer provided by LangGraph CLI: {checkpointer is not None}")
-    print(f"🔧 Checkpointer type: {type(checkpointer) if checkpointer else 'None'}")
+    logger.debug(
+        "create_deepagents_runtime called (checkpointer: %s)",
+        type(checkpointer).__name__ if checkpointer else None,
+    )
     
-    # Load test definition with prompts and tools from files
-    definition_path = Path(__file__).parent / "tests" / "mock" / "definition.json"
+    mtime_ns = _definition_mtime_ns(_DEFINITION_PATH)
     
-    if not definition_path.exists():
-        raise FileNotFoundError(
-            f"Test definition not found at {definition_path}. "
-            "Please ensure tests/mock/definition.json exists."
-        )
+    # Reuse the compiled graph when neither the checkpointer nor the
+    # definition changed (e.g. CLI reloads triggered by unrelated files)
+    key = id(checkpointer)
+    cached = _agent_cache.get(key)
+    if cached is not None and cached[0] is checkpointer and cached[1] == mtime_ns:
+        logger.debug("Reusing cached agent graph")
+        return cached[2]
     
     # Use helper to load definition with prompts and tools from files
-    definition = load_definition_with_files(definition_path)
+    definition = _load_definition(_DEFINITION_PATH, mtime_ns)
     
-    print(f"✓ Loaded definition with {len(definition.get('nodes', []))} nodes")
+    logger.debug("Loaded definition with %d nodes", len(definition.get("nodes", [])))
     
     # Build graph using GraphBuilder
     builder = GraphBuilder(checkpointer=checkpointer)
     agent = builder.build_from_definition(definition)
     
-    print("✓ Agent graph built successfully")
+    if key not in _agent_cache and len(_agent_cache) >= _AGENT_CACHE_SIZE:
+        # Evict the oldest entry (dicts preserve insertion order)
+        _agent_cache.pop(next(iter(_agent_cache)))
+    _agent_cache[key] = (checkpointer, mtime_ns, agent)
+    
+    logger.debug("Agent graph built successfully")
     return agent
@@ -251,6 +251,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             consumer_group="agent-executor-workers",
             execution_manager=execution_manager,
             cloudevent_emitter=cloudevent_emitter,
+            fetch_batch_size=int(os.getenv("NATS_FETCH_BATCH_SIZE", "1")),
         )
         set_nats_consumer(nats_consumer)
 
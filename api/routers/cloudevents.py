@@ -19,8 +19,9 @@ from models.events import JobExecutionEvent
 from services.cloudevents import CloudEventEmitter
 from api.dependencies import get_graph_builder, get_execution_manager, get_cloudevent_emitter
 from observability.metrics import (
-    deepagents_runtime_jobs_total,
-    deepagents_runtime_job_duration_seconds,
+    JOBS_COMPLETED,
+    JOBS_FAILED,
+    observe_job_duration,
 )
 
 # Import OpenTelemetry if available
@@ -139,7 +140,7 @@ async def process_cloudevent(
         )
 
         # Track job execution start time for metrics
-        job_start_time = time.time()
+        job_start_ns = time.monotonic_ns()
 
         # Orchestration logic: Build → Execute → Emit Result
         try:
@@ -191,9 +192,8 @@ async def process_cloudevent(
             logger.info("completed_event_emitted", job_id=job_id, trace_id=trace_id)
 
             # Record metrics for successful job completion
-            job_duration = time.time() - job_start_time
-            deepagents_runtime_jobs_total.labels(status='completed').inc()
-            deepagents_runtime_job_duration_seconds.observe(job_duration)
+            JOBS_COMPLETED.inc()
+            job_duration = observe_job_duration(job_start_ns)
 
             logger.info(
                 "job_metrics_recorded",
@@ -234,9 +234,8 @@ async def process_cloudevent(
             logger.info("failed_event_emitted", job_id=job_id, trace_id=trace_id)
 
             # Record metrics for failed job
-            job_duration = time.time() - job_start_time
-            deepagents_runtime_jobs_total.labels(status='failed').inc()
-            deepagents_runtime_job_duration_seconds.observe(job_duration)
+            JOBS_FAILED.inc()
+            job_duration = observe_job_duration(job_start_ns)
 
             logger.info(
                 "job_metrics_recorded",
@@ -2,6 +2,10 @@
 Prometheus metrics endpoint.
 
 This module provides the /metrics endpoint for Prometheus scraping.
+
+The response is always served uncompressed (Content-Encoding: identity). If a
+GZipMiddleware is ever added to the app, mount this router on a sub-application
+without compression rather than letting it gzip every scrape.
 """
 
 from fastapi import APIRouter, Response
@@ -10,6 +14,12 @@ from observability.metrics import get_metrics
 
 router = APIRouter(prefix="", tags=["metrics"])
 
+# Scrapes are served uncompressed and must never be cached by intermediaries
+METRICS_RESPONSE_HEADERS = {
+    "Content-Encoding": "identity",
+    "Cache-Control": "no-cache",
+}
+
 
 @router.get("/metrics")
 async def metrics() -> Response:
@@ -34,5 +44,7 @@ async def metrics() -> Response:
         - Requirements: 17.4, 17.5, Observable pillar
         - Design: Section 2.8 (Observability Design)
     """
-    metrics_data, content_type = get_metrics()
-    return Response(content=metrics_data, media_type=content_type)
\ No newline at end of file
+    payload = get_metrics()
+    return Response(
+        content=payload.body, media_type=payload.content_type, headers=METRICS_RESPONSE_HEADERS
+    )
@@ -23,22 +23,24 @@ Or use the modular functions directly:
     )
 """
 
-# Main API
-from core.builder import (
-    GraphBuilder,
-    GraphBuilderError
-)
-
-# Modular functions
-from core.tool_loader import (
-    load_tools_from_definition,
-    ToolLoadingError
-)
-from core.model_identifier import create_model_identifier
-from core.subagent_builder import (
-    build_subagent,
-    SubAgentCompilationError
-)
+import importlib
+
+# Symbols are resolved lazily on first attribute access (PEP 562): the
+# submodules pull in LangGraph/LangChain, which are expensive to import.
+_LAZY_IMPORTS = {
+    # Main API
+    "GraphBuilder": "core.builder",
+    "GraphBuilderError": "core.builder",
+
+    # Modular functions
+    "load_tools_from_definition": "core.tool_loader",
+    "create_model_identifier": "core.model_identifier",
+    "build_subagent": "core.subagent_builder",
+
+    # Exceptions
+    "ToolLoadingError": "core.tool_loader",
+    "SubAgentCompilationError": "core.subagent_builder",
+}
 
 __all__ = [
     # Main API
@@ -54,3 +56,18 @@ __all__ = [
     "ToolLoadingError",
     "SubAgentCompilationError"
 ]
+
+
+def __getattr__(name: str):
+    """Import the requested symbol on first access and cache it on the package."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -18,6 +18,9 @@ References:
     - Design: Section 2.12 (Dynamic Tool Loading)
 """
 
+import functools
+from types import CodeType
+
 import structlog
 from typing import Any, Dict, List
 from langchain_core.tools import BaseTool
@@ -30,6 +33,19 @@ class ToolLoadingError(Exception):
     pass
 
 
+@functools.lru_cache(maxsize=128)
+def _compile_tool_script(tool_script: str, tool_name: str) -> CodeType:
+    """
+    Compile a tool script to a code object, memoized on the script source.
+
+    Definitions are rebuilt on every CLI reload and per job, usually with the
+    same scripts; reusing the code object skips parsing and bytecode
+    compilation. Each build still exec()s into a fresh namespace, so tool
+    instances are never shared between graphs.
+    """
+    return compile(tool_script, f"<tool:{tool_name}>", "exec")
+
+
 def load_tools_from_definition(
     tool_definitions: List[Dict[str, Any]]
 ) -> Dict[str, BaseTool]:
@@ -115,7 +131,7 @@ def load_tools_from_definition(
 
             # SECURITY WARNING: exec() executes arbitrary code
             # Only use with trusted tool definitions
-            exec(tool_script, namespace)
+            exec(_compile_tool_script(tool_script, tool_name), namespace)
 
             # Extract BaseTool instances from namespace
             tool_instance = None
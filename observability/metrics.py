@@ -13,135 +13,423 @@ Metrics:
     - deepagents_runtime_nats_messages_processed_total: Counter for NATS messages processed
     - deepagents_runtime_nats_messages_failed_total: Counter for NATS messages failed
 
+Registries:
+    build_metrics(registry) creates every collector on the given registry and
+    returns them as a Metrics dataclass. The module-level metric names are
+    bound to build_metrics(REGISTRY) lazily, on first access (PEP 562), so
+    prometheus_client is not imported by processes that never record or serve
+    metrics. Tests that need isolated metrics build their own set on a fresh
+    CollectorRegistry instead.
+
+Serving:
+    get_metrics() returns the raw exposition bytes. The /metrics route
+    (api/routers/metrics.py) sends them as-is with Content-Encoding: identity;
+    do not put the endpoint behind GZipMiddleware, since compressing the text
+    payload costs more CPU per scrape than it saves on the wire.
+
 References:
     - Tasks: Task 1.6, 9.3 (Add Prometheus metrics)
     - Requirements: 17.5, Observable pillar
     - Design: Section 2.8 (Observability Design)
 """
 
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST, CollectorRegistry, REGISTRY
-
-# Use a separate registry for tests to avoid conflicts
 import os
-if os.getenv('PYTEST_CURRENT_TEST'):
-    # Create a separate registry for tests
-    test_registry = CollectorRegistry()
-    registry = test_registry
-else:
-    # Use the default registry for production
-    registry = REGISTRY
-
-# Job execution metrics
-deepagents_runtime_jobs_total = Counter(
-    'deepagents_runtime_jobs_total',
-    'Total number of agent execution jobs processed',
-    ['status'],  # status=completed|failed
-    registry=registry
-)
+import threading
+import time
+import weakref
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
 
-deepagents_runtime_job_duration_seconds = Histogram(
-    'deepagents_runtime_job_duration_seconds',
-    'Duration of agent execution jobs in seconds',
-    buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0],
-    registry=registry
-)
+if TYPE_CHECKING:
+    from prometheus_client import Counter, Histogram, CollectorRegistry
 
-# Infrastructure metrics
-deepagents_runtime_db_connection_errors_total = Counter(
-    'deepagents_runtime_db_connection_errors_total',
-    'Total number of database connection errors',
-    registry=registry
-)
+# Staged increments are pushed to Prometheus every N events or T seconds
+_BATCH_SIZE = 64
+_BATCH_FLUSH_INTERVAL_SEC = 0.25
+# Live BatchedCounters; a counter drops out once it is garbage collected
+_batched_counters: "weakref.WeakSet[BatchedCounter]" = weakref.WeakSet()
+_batched_counters_lock = threading.Lock()
 
-# Redis metrics (optional but useful for monitoring)
-deepagents_runtime_redis_publish_total = Counter(
-    'deepagents_runtime_redis_publish_total',
-    'Total number of Redis stream events published',
-    ['event_type'],  # event_type=on_llm_stream|on_tool_start|on_tool_end|end|unknown
-    registry=registry
-)
 
-deepagents_runtime_redis_publish_errors_total = Counter(
-    'deepagents_runtime_redis_publish_errors_total',
-    'Total number of Redis publish errors',
-    registry=registry
-)
+class _StagedIncrements:
+    """One thread's running totals for a BatchedCounter, written only by that thread."""
 
-# NATS metrics
-deepagents_runtime_nats_messages_processed_total = Counter(
-    'deepagents_runtime_nats_messages_processed_total',
-    'Total number of NATS messages processed successfully',
-    registry=registry
-)
+    __slots__ = ("thread", "totals", "flushed", "staged", "last_flush")
 
-deepagents_runtime_nats_messages_failed_total = Counter(
-    'deepagents_runtime_nats_messages_failed_total',
-    'Total number of NATS messages that failed processing',
-    registry=registry
-)
+    def __init__(self) -> None:
+        self.thread = threading.current_thread()
+        # Cumulative increments per label-value tuple (owner thread only)
+        self.totals: dict[tuple[str, ...], float] = {}
+        # Portion of totals already pushed to the Counter (flush lock only)
+        self.flushed: dict[tuple[str, ...], float] = {}
+        self.staged = 0
+        self.last_flush = time.monotonic()
 
-# HTTP API metrics
-deepagents_runtime_http_requests_total = Counter(
-    'deepagents_runtime_http_requests_total',
-    'Total number of HTTP API requests',
-    ['method', 'endpoint', 'status'],  # method=GET|POST, endpoint=invoke|state, status=200|400|500
-    registry=registry
-)
 
-deepagents_runtime_http_request_duration_seconds = Histogram(
-    'deepagents_runtime_http_request_duration_seconds',
-    'Duration of HTTP API requests in seconds',
-    ['method', 'endpoint'],
-    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
-    registry=registry
-)
+class BatchedCounter:
+    """
+    Stages Counter increments per thread and applies them in batches.
 
-# WebSocket metrics
-deepagents_runtime_websocket_connections_total = Counter(
-    'deepagents_runtime_websocket_connections_total',
-    'Total number of WebSocket connections established',
-    registry=registry
-)
+    bump() only updates the calling thread's running totals, so the hot path
+    takes no lock at all. Once batch_size events are staged or flush_interval
+    seconds have passed, the thread flushes: under the counter's lock, the
+    increments not yet pushed are applied to the wrapped Counter, once per
+    label-value tuple. The prometheus_client child lock and label lookup are
+    paid once per batch instead of once per event. get_metrics() flushes every
+    batched counter before serializing, so scrapes never miss staged increments.
 
-deepagents_runtime_websocket_connections_active = Counter(
-    'deepagents_runtime_websocket_connections_active',
-    'Number of currently active WebSocket connections',
-    registry=registry
-)
+    The wrapped Counter stays registered as-is; only the write path changes.
+    """
 
-deepagents_runtime_websocket_messages_sent_total = Counter(
-    'deepagents_runtime_websocket_messages_sent_total',
-    'Total number of WebSocket messages sent',
-    ['event_type'],  # event_type=on_state_update|on_llm_stream|end|error
-    registry=registry
-)
+    def __init__(
+        self,
+        counter: "Counter",
+        prebound: Iterable[tuple[str, ...]] = ((),),
+        batch_size: int = _BATCH_SIZE,
+        flush_interval: float = _BATCH_FLUSH_INTERVAL_SEC,
+    ) -> None:
+        self.counter = counter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._children = {labels: self._bind(labels) for labels in prebound}
+        self._local = threading.local()
+        self._staged_by_thread: list[_StagedIncrements] = []
+        self._lock = threading.Lock()
+        with _batched_counters_lock:
+            _batched_counters.add(self)
 
-deepagents_runtime_websocket_duration_seconds = Histogram(
-    'deepagents_runtime_websocket_duration_seconds',
-    'Duration of WebSocket connections in seconds',
-    buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
-    registry=registry
-)
+    def bump(self, labels: tuple[str, ...] = (), n: float = 1) -> None:
+        """Stage an increment of n for the given label values."""
+        try:
+            staged = self._local.staged
+        except AttributeError:
+            staged = self._register_thread()
+
+        totals = staged.totals
+        totals[labels] = totals.get(labels, 0) + n
+        staged.staged += 1
+        if (
+            staged.staged >= self.batch_size
+            or time.monotonic() - staged.last_flush >= self.flush_interval
+        ):
+            staged.staged = 0
+            staged.last_flush = time.monotonic()
+            self.flush()
+
+    def flush(self) -> None:
+        """Push all staged increments, from every thread, to the wrapped Counter."""
+        with self._lock:
+            for staged in list(self._staged_by_thread):
+                # Check before reading: a finished thread can no longer stage,
+                # so its totals are complete and it can be dropped afterwards
+                alive = staged.thread.is_alive()
+                # dict.copy() is atomic under the GIL, unlike iterating the live dict
+                for labels, total in staged.totals.copy().items():
+                    delta = total - staged.flushed.get(labels, 0)
+                    if delta:
+                        self._child(labels).inc(delta)
+                        staged.flushed[labels] = total
+                if not alive:
+                    self._staged_by_thread.remove(staged)
+
+    def _register_thread(self) -> _StagedIncrements:
+        staged = self._local.staged = _StagedIncrements()
+        with self._lock:
+            self._staged_by_thread.append(staged)
+        return staged
+
+    def _bind(self, labels: tuple[str, ...]):
+        return self.counter.labels(*labels) if labels else self.counter
+
+    def _child(self, labels: tuple[str, ...]):
+        child = self._children.get(labels)
+        if child is None:
+            # Label values can be open-ended; bind new ones once and reuse them
+            child = self._children[labels] = self._bind(labels)
+        return child
+
+
+def flush_batched_counters() -> None:
+    """Flush every BatchedCounter so the registry reflects all staged increments."""
+    with _batched_counters_lock:
+        batched_counters = list(_batched_counters)
+    for batched in batched_counters:
+        batched.flush()
+
+
+@dataclass(frozen=True)
+class Metrics:
+    """Every service collector, registered on a single registry."""
+
+    deepagents_runtime_jobs_total: "Counter"
+    deepagents_runtime_job_duration_seconds: "Histogram"
+    deepagents_runtime_db_connection_errors_total: "Counter"
+    deepagents_runtime_redis_publish_total: "Counter"
+    deepagents_runtime_redis_publish_errors_total: "Counter"
+    deepagents_runtime_nats_messages_processed_total: "Counter"
+    deepagents_runtime_nats_messages_failed_total: "Counter"
+    deepagents_runtime_http_requests_total: "Counter"
+    deepagents_runtime_http_request_duration_seconds: "Histogram"
+    deepagents_runtime_websocket_connections_total: "Counter"
+    deepagents_runtime_websocket_connections_active: "Counter"
+    deepagents_runtime_websocket_messages_sent_total: "Counter"
+    deepagents_runtime_websocket_duration_seconds: "Histogram"
+    deepagents_runtime_health_checks_total: "Counter"
+
+
+def build_metrics(registry: Optional["CollectorRegistry"] = None) -> Metrics:
+    """
+    Create every service metric on the given registry.
+
+    Collectors can only be registered once per registry, so call this once
+    per registry and share the result.
+
+    Args:
+        registry: Registry to register the collectors on; a fresh
+            CollectorRegistry is created when omitted
+
+    Returns:
+        Metrics holding the registered Counters and Histograms
+    """
+    from prometheus_client import Counter, Histogram, CollectorRegistry
+
+    if registry is None:
+        registry = CollectorRegistry()
 
-# Health check metrics
-deepagents_runtime_health_checks_total = Counter(
-    'deepagents_runtime_health_checks_total',
-    'Total number of health check requests',
-    ['type', 'status'],  # type=liveness|readiness, status=healthy|unhealthy
-    registry=registry
+    return Metrics(
+        # Job execution metrics
+        deepagents_runtime_jobs_total=Counter(
+            'deepagents_runtime_jobs_total',
+            'Total number of agent execution jobs processed',
+            ['status'],  # status=completed|failed
+            registry=registry
+        ),
+        deepagents_runtime_job_duration_seconds=Histogram(
+            'deepagents_runtime_job_duration_seconds',
+            'Duration of agent execution jobs in seconds',
+            buckets=[0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0],
+            registry=registry
+        ),
+        # Infrastructure metrics
+        deepagents_runtime_db_connection_errors_total=Counter(
+            'deepagents_runtime_db_connection_errors_total',
+            'Total number of database connection errors',
+            registry=registry
+        ),
+        # Redis metrics (optional but useful for monitoring)
+        deepagents_runtime_redis_publish_total=Counter(
+            'deepagents_runtime_redis_publish_total',
+            'Total number of Redis stream events published',
+            ['event_type'],  # event_type=on_llm_stream|on_tool_start|on_tool_end|end|unknown
+            registry=registry
+        ),
+        deepagents_runtime_redis_publish_errors_total=Counter(
+            'deepagents_runtime_redis_publish_errors_total',
+            'Total number of Redis publish errors',
+            registry=registry
+        ),
+        # NATS metrics
+        deepagents_runtime_nats_messages_processed_total=Counter(
+            'deepagents_runtime_nats_messages_processed_total',
+            'Total number of NATS messages processed successfully',
+            registry=registry
+        ),
+        deepagents_runtime_nats_messages_failed_total=Counter(
+            'deepagents_runtime_nats_messages_failed_total',
+            'Total number of NATS messages that failed processing',
+            registry=registry
+        ),
+        # HTTP API metrics
+        deepagents_runtime_http_requests_total=Counter(
+            'deepagents_runtime_http_requests_total',
+            'Total number of HTTP API requests',
+            ['method', 'endpoint', 'status'],  # method=GET|POST, endpoint=invoke|state, status=200|400|500
+            registry=registry
+        ),
+        deepagents_runtime_http_request_duration_seconds=Histogram(
+            'deepagents_runtime_http_request_duration_seconds',
+            'Duration of HTTP API requests in seconds',
+            ['method', 'endpoint'],
+            buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0],
+            registry=registry
+        ),
+        # WebSocket metrics
+        deepagents_runtime_websocket_connections_total=Counter(
+            'deepagents_runtime_websocket_connections_total',
+            'Total number of WebSocket connections established',
+            registry=registry
+        ),
+        deepagents_runtime_websocket_connections_active=Counter(
+            'deepagents_runtime_websocket_connections_active',
+            'Number of currently active WebSocket connections',
+            registry=registry
+        ),
+        deepagents_runtime_websocket_messages_sent_total=Counter(
+            'deepagents_runtime_websocket_messages_sent_total',
+            'Total number of WebSocket messages sent',
+            ['event_type'],  # event_type=on_state_update|on_llm_stream|end|error
+            registry=registry
+        ),
+        deepagents_runtime_websocket_duration_seconds=Histogram(
+            'deepagents_runtime_websocket_duration_seconds',
+            'Duration of WebSocket connections in seconds',
+            buckets=[1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0],
+            registry=registry
+        ),
+        # Health check metrics
+        deepagents_runtime_health_checks_total=Counter(
+            'deepagents_runtime_health_checks_total',
+            'Total number of health check requests',
+            ['type', 'status'],  # type=liveness|readiness, status=healthy|unhealthy
+            registry=registry
+        ),
+    )
+
+
+# Service metrics on the default registry, built on first access.
+# The annotations declare the lazily bound names; _build() assigns them.
+registry: "CollectorRegistry"
+METRICS: Metrics
+deepagents_runtime_jobs_total: "Counter"
+deepagents_runtime_job_duration_seconds: "Histogram"
+deepagents_runtime_db_connection_errors_total: "Counter"
+deepagents_runtime_redis_publish_total: "Counter"
+deepagents_runtime_redis_publish_errors_total: "Counter"
+deepagents_runtime_nats_messages_processed_total: "Counter"
+deepagents_runtime_nats_messages_failed_total: "Counter"
+deepagents_runtime_http_requests_total: "Counter"
+deepagents_runtime_http_request_duration_seconds: "Histogram"
+deepagents_runtime_websocket_connections_total: "Counter"
+deepagents_runtime_websocket_connections_active: "Counter"
+deepagents_runtime_websocket_messages_sent_total: "Counter"
+deepagents_runtime_websocket_duration_seconds: "Histogram"
+deepagents_runtime_health_checks_total: "Counter"
+
+# Pre-bound label children for the hot job-completion path
+JOBS_COMPLETED: "Counter"
+JOBS_FAILED: "Counter"
+
+# Batched write paths (see BatchedCounter)
+REDIS_PUBLISH: BatchedCounter
+NATS_MESSAGES_PROCESSED: BatchedCounter
+
+_LAZY_NAMES = frozenset(
+    [field.name for field in fields(Metrics)]
+    + ["registry", "METRICS", "JOBS_COMPLETED", "JOBS_FAILED", "REDIS_PUBLISH", "NATS_MESSAGES_PROCESSED"]
 )
+_metrics: Optional[Metrics] = None
+_build_lock = threading.Lock()
+
+
+def _build() -> None:
+    """Register the service metrics on the default registry and bind the lazy names."""
+    global _metrics
+    from prometheus_client import REGISTRY
+
+    metrics = build_metrics(REGISTRY)
+    namespace = dict(vars(metrics))
+    namespace.update(
+        registry=REGISTRY,
+        METRICS=metrics,
+        JOBS_COMPLETED=metrics.deepagents_runtime_jobs_total.labels(status="completed"),
+        JOBS_FAILED=metrics.deepagents_runtime_jobs_total.labels(status="failed"),
+        REDIS_PUBLISH=BatchedCounter(
+            metrics.deepagents_runtime_redis_publish_total,
+            prebound=[
+                (event_type,)
+                for event_type in (
+                    "on_llm_stream", "on_state_update", "on_tool_start", "on_tool_end", "end", "unknown"
+                )
+            ],
+        ),
+        NATS_MESSAGES_PROCESSED=BatchedCounter(
+            metrics.deepagents_runtime_nats_messages_processed_total
+        ),
+    )
+    # Bind the names before publishing _metrics so readers never see a partial build
+    globals().update(namespace)
+    _metrics = metrics
+
+
+def _ensure_built() -> Metrics:
+    """Return the service metrics, building them on first call."""
+    if _metrics is None:
+        with _build_lock:
+            if _metrics is None:
+                _build()
+    return _metrics
+
+
+def __getattr__(name: str):
+    """Build the service metrics on first access of any lazily bound name."""
+    if name not in _LAZY_NAMES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    _ensure_built()
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_NAMES)
+
+
+def observe_job_duration(start_ns: int) -> float:
+    """
+    Record a job duration measured from a time.monotonic_ns() start.
 
+    Using the monotonic clock keeps durations immune to wall-clock (NTP)
+    adjustments; the nanosecond delta is converted to seconds once here.
 
-def get_metrics() -> tuple[bytes, str]:
+    Returns:
+        The observed duration in seconds
+    """
+    duration = (time.monotonic_ns() - start_ns) / 1e9
+    _ensure_built().deepagents_runtime_job_duration_seconds.observe(duration)
+    return duration
+
+
+def count_redis_publish(event_type: str) -> None:
+    """Stage one Redis publish for event_type on the batched counter."""
+    _ensure_built()
+    REDIS_PUBLISH.bump((event_type,))
+
+
+class MetricsPayload(NamedTuple):
+    """Serialized metrics body and its Prometheus content type."""
+
+    body: bytes
+    content_type: str
+
+
+# Cached exposition output shared by concurrent scrapes.
+# Set METRICS_CACHE_TTL_SEC=0 to regenerate on every scrape.
+_METRICS_CACHE_TTL = float(os.getenv("METRICS_CACHE_TTL_SEC", "0.5"))
+_metrics_cache: Optional[tuple[MetricsPayload, float]] = None
+_metrics_cache_lock = threading.Lock()
+
+
+def _generate_metrics() -> MetricsPayload:
+    """Flush staged increments and serialize the default registry."""
+    from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+
+    _ensure_built()
+    flush_batched_counters()
+    return MetricsPayload(generate_latest(registry), CONTENT_TYPE_LATEST)
+
+
+def get_metrics() -> MetricsPayload:
     """
     Generate Prometheus metrics in text format.
 
     This function collects all registered metrics and formats them according
     to the Prometheus text exposition format for scraping by Prometheus server.
+    The serialized output is reused for METRICS_CACHE_TTL_SEC seconds (default
+    0.5) so bursts of scrapes share a single generate_latest() pass; cache hits
+    return the same MetricsPayload object.
 
     Returns:
-        Tuple of (metrics_bytes, content_type) where:
-        - metrics_bytes: Prometheus metrics in text format (bytes)
+        MetricsPayload (body, content_type) where:
+        - body: Prometheus metrics in text format (bytes)
         - content_type: MIME type for Prometheus metrics format
 
     Example:
@@ -153,4 +441,20 @@ def get_metrics() -> tuple[bytes, str]:
         - Tasks: Task 9.3
         - Requirements: Observable pillar
     """
-    return generate_latest(registry), CONTENT_TYPE_LATEST
+    global _metrics_cache
+
+    if _METRICS_CACHE_TTL <= 0:
+        return _generate_metrics()
+
+    cached = _metrics_cache
+    if cached is not None and time.monotonic() - cached[1] < _METRICS_CACHE_TTL:
+        return cached[0]
+
+    with _metrics_cache_lock:
+        # Another scrape may have refreshed the cache while we waited
+        cached = _metrics_cache
+        if cached is None or time.monotonic() - cached[1] >= _METRICS_CACHE_TTL:
+            cached = (_generate_metrics(), time.monotonic())
+            _metrics_cache = cached
+
+    return cached[0]
@@ -1,9 +1,33 @@
-"""External service integrations (Redis, CloudEvents)."""
+"""External service integrations (Redis, CloudEvents).
 
-from services.redis import RedisClient
-from services.cloudevents import CloudEventEmitter
+Symbols are resolved lazily on first attribute access (PEP 562) so that
+importing one service does not pull in the client libraries of the others.
+"""
+
+import importlib
+
+# Map of public name -> defining submodule
+_LAZY_IMPORTS = {
+    "RedisClient": "services.redis",
+    "CloudEventEmitter": "services.cloudevents",
+}
 
 __all__ = [
     "RedisClient",
     "CloudEventEmitter"
 ]
+
+
+def __getattr__(name: str):
+    """Import the requested symbol on first access and cache it on the package."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
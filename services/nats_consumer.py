@@ -37,7 +37,7 @@ from core.executor import ExecutionManager
 from models.events import JobExecutionEvent
 from services.cloudevents import CloudEventEmitter
 from observability.metrics import (
-    deepagents_runtime_nats_messages_processed_total,
+    NATS_MESSAGES_PROCESSED,
     deepagents_runtime_nats_messages_failed_total
 )
 
@@ -78,7 +78,8 @@ class NATSConsumer:
         stream_name: str,
         consumer_group: str,
         execution_manager: ExecutionManager,
-        cloudevent_emitter: CloudEventEmitter
+        cloudevent_emitter: CloudEventEmitter,
+        fetch_batch_size: int = 1
     ) -> None:
         """
         Initialize NATSConsumer with configuration.
@@ -89,6 +90,10 @@ class NATSConsumer:
             consumer_group: Durable consumer name (e.g., "agent-executor-workers")
             execution_manager: ExecutionManager instance for executing agents
             cloudevent_emitter: CloudEventEmitter instance for publishing results
+            fetch_batch_size: Messages requested per fetch round-trip. Messages
+                are still processed and acked one at a time, so keep this small
+                for long-running jobs: every fetched message must finish within
+                ack_wait and is unavailable to other replicas meanwhile.
 
         References:
             - Requirements: Req. 1.2, 13.2
@@ -99,16 +104,20 @@ class NATSConsumer:
         self.consumer_group = consumer_group
         self.execution_manager = execution_manager
         self.cloudevent_emitter = cloudevent_emitter
+        self.fetch_batch_size = fetch_batch_size
         
         self.nc: Optional[nats.NATS] = None
         self.js: Optional[JetStreamContext] = None
         self.running = False
+        # Set once the NATS connection and JetStream context are ready
+        self._connected = asyncio.Event()
 
         logger.info(
             "nats_consumer_initialized",
             nats_url=self.nats_url,
             stream_name=self.stream_name,
-            consumer_group=self.consumer_group
+            consumer_group=self.consumer_group,
+            fetch_batch_size=self.fetch_batch_size
         )
 
     async def start(self) -> None:
@@ -137,6 +146,7 @@ class NATSConsumer:
             # Connect to NATS with timeout to prevent hanging
             self.nc = await nats.connect(self.nats_url, connect_timeout=10)
             self.js = self.nc.jetstream()
+            self._connected.set()
             
             logger.info("nats_connected", nats_url=self.nats_url)
 
@@ -179,7 +189,7 @@ class NATSConsumer:
             while self.running:
                 try:
                     # Fetch messages in batches
-                    msgs = await consumer.fetch(batch=1, timeout=5)
+                    msgs = await consumer.fetch(batch=self.fetch_batch_size, timeout=5)
                     
                     for msg in msgs:
                         try:
@@ -220,6 +230,7 @@ class NATSConsumer:
             )
             raise
         finally:
+            self._connected.clear()
             if self.nc and not self.nc.is_closed:
                 await self.nc.close()
                 logger.info("nats_connection_closed")
@@ -237,6 +248,7 @@ class NATSConsumer:
         """
         logger.info("stopping_nats_consumer")
         self.running = False
+        self._connected.clear()
         
         if self.nc and not self.nc.is_closed:
             await self.nc.close()
@@ -247,7 +259,8 @@ class NATSConsumer:
         Process a NATS message containing a CloudEvent.
 
         This method:
-        1. Parses the message data as a CloudEvent
+        1. Parses the message data as a CloudEvent (structured mode, or binary
+           mode with ce-* headers and the event data as the body)
         2. Extracts JobExecutionEvent from CloudEvent data
         3. Builds LangGraph agent from agent_definition
         4. Executes agent using ExecutionManager
@@ -265,26 +278,35 @@ class NATSConsumer:
             - Tasks: Task 1.2
         """
         try:
-            # Parse message data as JSON
-            message_data = json.loads(msg.data.decode())
+            # Parse message data as JSON (json.loads accepts the raw bytes)
+            message_data = json.loads(msg.data)
+            
+            # Binary content mode carries CloudEvent attributes as ce-* headers
+            # and the event data as the raw body
+            headers = getattr(msg, "headers", None) or {}
+            binary_mode = "ce-specversion" in headers
+            # A non-object body is passed through as-is and fails validation below
+            structured = not binary_mode and isinstance(message_data, dict)
             
             logger.info(
                 "processing_nats_message",
                 subject=msg.subject,
-                sequence=msg.metadata.sequence.stream if msg.metadata else None
+                sequence=msg.metadata.sequence.stream if msg.metadata else None,
+                cloudevent_id=message_data.get("id") if structured else headers.get("ce-id"),
+                binary_mode=binary_mode
             )
 
             # Extract JobExecutionEvent from CloudEvent data
-            # CloudEvent structure: {"data": {...}, "type": "...", ...}
-            if "data" in message_data:
+            # Structured mode: {"data": {...}, "type": "...", ...}
+            if structured and "data" in message_data:
                 event_data = message_data["data"]
             else:
-                # If no 'data' field, assume the body itself is the event data
+                # Binary mode, or no 'data' field: the body itself is the event data
                 event_data = message_data
 
             # Validate and parse JobExecutionEvent using Pydantic
             try:
-                job_event = JobExecutionEvent(**event_data)
+                job_event = JobExecutionEvent.model_validate(event_data)
             except ValidationError as e:
                 logger.error(
                     "malformed_job_execution_event",
@@ -337,7 +359,7 @@ class NATSConsumer:
             )
 
             # Record success metric
-            deepagents_runtime_nats_messages_processed_total.inc()
+            NATS_MESSAGES_PROCESSED.bump()
 
         except Exception as e:
             # Execution failure: Publish failed CloudEvent
@@ -473,6 +495,9 @@ class NATSConsumer:
         """
         Wait for NATS connection to be established.
 
+        Waits on the readiness event set by start() rather than polling, so
+        callers resume as soon as the connection is up.
+
         Args:
             timeout: Maximum time to wait in seconds
 
@@ -483,12 +508,11 @@ class NATSConsumer:
             - Requirements: Req. 17.3
             - Tasks: Task 1.6
         """
-        start_time = asyncio.get_event_loop().time()
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            if self.nc is not None and not self.nc.is_closed:
-                return True
-            await asyncio.sleep(0.1)
-        return False
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return False
+        return self.nc is not None and not self.nc.is_closed
 
     def health_check(self) -> bool:
         """
@@ -24,7 +24,7 @@ except ImportError:
     OTEL_AVAILABLE = False
 
 from observability.metrics import (
-    deepagents_runtime_redis_publish_total,
+    count_redis_publish,
     deepagents_runtime_redis_publish_errors_total
 )
 
@@ -167,7 +167,7 @@ class RedisClient:
                     subscriber_count = self.client.publish(channel, message)
 
                     # Record metrics for successful publish
-                    deepagents_runtime_redis_publish_total.labels(event_type=event_type).inc()
+                    count_redis_publish(event_type)
 
                     # Structured logging with correlation IDs
                     logger.info(
@@ -217,7 +217,7 @@ class RedisClient:
                 subscriber_count = self.client.publish(channel, message)
 
                 # Record metrics for successful publish
-                deepagents_runtime_redis_publish_total.labels(event_type=event_type).inc()
+                count_redis_publish(event_type)
 
                 # Structured logging with correlation IDs
                 logger.info(
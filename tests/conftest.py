@@ -0,0 +1,20 @@
+"""
+Shared pytest configuration for the deepagents-runtime test suite.
+"""
+
+import pytest
+
+from tests.utils.test_config import TestConfig
+
+
+@pytest.fixture(autouse=True)
+def reset_test_config():
+    """
+    Re-read cached TestConfig settings around every test.
+    
+    Tests (and conftest setup) may change MOCK_* variables; without this a
+    value cached by an earlier test would silently win.
+    """
+    TestConfig.reset()
+    yield
+    TestConfig.reset()
@@ -6,22 +6,30 @@ running in Kubernetes clusters. It automatically detects the environment
 and configures services to use in-cluster DNS names.
 
 Usage:
-    # In any test conftest.py, import this before other imports:
+    # Opt in for a test session (runs once via the session fixture in conftest.py):
+    PYTEST_CLUSTER_SETUP=1 pytest tests/integration
+
+    # Or call it explicitly from a fixture:
     from tests.integration.in_cluster_conftest import setup_in_cluster_environment
-    
-    # Call setup at module level (before pytest fixtures)
     setup_in_cluster_environment()
 
+    # Log the resulting configuration:
+    pytest tests/integration --log-cli-level=DEBUG
+
 Features:
 - Automatic in-cluster service discovery
 - Standardized environment variable naming
 - Fallback to localhost for local development
-- Debug logging for troubleshooting
+- Debug logging for troubleshooting (logger: tests.integration.in_cluster_conftest)
 """
 
+import functools
+import logging
 import os
 from typing import Dict, Optional
 
+logger = logging.getLogger(__name__)
+
 # ==============================================================================
 # IN-CLUSTER SERVICE CONFIGURATION
 # ==============================================================================
@@ -63,10 +71,14 @@ ENV_VAR_MAPPINGS = {
     "NATS_URL": ("nats", "url"),
 }
 
+@functools.lru_cache(maxsize=1)
 def is_running_in_cluster() -> bool:
     """
     Detect if we're running inside a Kubernetes cluster.
     
+    The result is cached for the lifetime of the process; call
+    is_running_in_cluster.cache_clear() after changing the environment.
+    
     Returns:
         bool: True if running in cluster, False otherwise
     """
@@ -121,19 +133,16 @@ def setup_in_cluster_environment(force_in_cluster: Optional[bool] = None) -> Dic
     else:
         use_in_cluster = is_running_in_cluster()
     
-    # Set environment variables
+    # Collect values for unset variables (don't override existing values)
     env_vars_set = {}
     
     for env_var, (service, key) in ENV_VAR_MAPPINGS.items():
-        # Skip if already set (don't override existing values)
         if os.environ.get(env_var):
             continue
-            
+        
         # Get the appropriate value
         value = get_service_config(service, key, use_fallback=not use_in_cluster)
-        
         if value:
-            os.environ[env_var] = value
             env_vars_set[env_var] = value
     
     # Set additional standard variables
@@ -143,38 +152,24 @@ def setup_in_cluster_environment(force_in_cluster: Optional[bool] = None) -> Dic
         "MOCK_TIMEOUT": "60"
     }
     
-    for var, default_value in additional_vars.items():
-        if not os.environ.get(var):
-            os.environ[var] = default_value
-            env_vars_set[var] = default_value
-    
-    # Print configuration for debugging
-    print("\n" + "=" * 80)
-    print("IN-CLUSTER TEST ENVIRONMENT CONFIGURATION")
-    print("=" * 80)
-    print(f"Environment: {'In-Cluster' if use_in_cluster else 'Local Development'}")
-    print(f"Auto-detected: {is_running_in_cluster()}")
-    
-    # Group by service for better readability
-    services_config = {}
-    for env_var, value in env_vars_set.items():
-        if "POSTGRES" in env_var or "DB" in env_var:
-            services_config.setdefault("PostgreSQL", {})[env_var] = value
-        elif "REDIS" in env_var or "DRAGONFLY" in env_var:
-            services_config.setdefault("Redis/Dragonfly", {})[env_var] = value
-        elif "NATS" in env_var:
-            services_config.setdefault("NATS", {})[env_var] = value
-        else:
-            services_config.setdefault("Other", {})[env_var] = value
-    
-    for service_name, config in services_config.items():
-        print(f"\n{service_name}:")
-        for var, value in config.items():
-            # Mask passwords
-            display_value = "*" * len(value) if "PASSWORD" in var and value else value
-            print(f"  {var}: {display_value}")
-    
-    print("=" * 80 + "\n")
+    env_vars_set.update(
+        {var: value for var, value in additional_vars.items() if not os.environ.get(var)}
+    )
+    
+    # Apply all writes in one pass
+    os.environ.update(env_vars_set)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Test environment: %s (auto-detected in-cluster: %s); set %s",
+            "In-Cluster" if use_in_cluster else "Local Development",
+            is_running_in_cluster(),
+            ", ".join(
+                # Mask passwords
+                f"{var}={'*' * len(value) if 'PASSWORD' in var else value}"
+                for var, value in env_vars_set.items()
+            ) or "nothing",
+        )
     
     return env_vars_set
 
@@ -250,6 +245,5 @@ def require_service(service_name: str) -> None:
 # ==============================================================================
 
 # Note: Auto-setup disabled to allow Kubernetes secret environment variables
-# to take precedence. Tests should call setup_in_cluster_environment() explicitly
-# if needed for local development.
-# setup_in_cluster_environment()
\ No newline at end of file
+# to take precedence. Set PYTEST_CLUSTER_SETUP=1 to run it once per session
+# (see the cluster_env fixture in conftest.py) for local development.
\ No newline at end of file
@@ -41,6 +41,7 @@ import json
 import os
 import time
 import asyncio
+from itertools import islice
 from pathlib import Path
 from typing import Any, Dict, Generator, List
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
@@ -526,8 +527,7 @@ async def test_agent_generation_end_to_end_success(
                     files_data = last_state_update.get("data", {}).get("files", {})
                     print(f"[DEBUG] - Files in last state update: {len(files_data)} files")
                     if files_data:
-                        file_paths = list(files_data.keys())
-                        print(f"[DEBUG] - File paths: {file_paths[:5]}{'...' if len(file_paths) > 5 else ''}")
+                        print(f"[DEBUG] - File paths: {list(islice(files_data, 5))}{'...' if len(files_data) > 5 else ''}")
                     else:
                         print(f"[DEBUG] - WARNING: No files found in last state update")
                 else:
@@ -624,10 +624,10 @@ async def test_agent_generation_end_to_end_success(
                     files_data = event.get("data", {}).get("files", {})
                     print(f"[DEBUG] State update {i}: {len(files_data)} files")
                     if files_data:
-                        print(f"[DEBUG] File keys: {list(files_data.keys())[:3]}{'...' if len(files_data) > 3 else ''}")
+                        print(f"[DEBUG] File keys: {list(islice(files_data, 3))}{'...' if len(files_data) > 3 else ''}")
                         
                         # Check file content structure
-                        first_file_key = list(files_data.keys())[0]
+                        first_file_key = next(iter(files_data))
                         first_file_data = files_data[first_file_key]
                         print(f"[DEBUG] Sample file structure: {type(first_file_data)}")
                         if isinstance(first_file_data, dict):
@@ -986,7 +986,7 @@ async def test_agent_generation_end_to_end_success(
                     if isinstance(files_data, dict):
                         actual_result["files"] = files_data
                         print(f"[DEBUG] ✅ Successfully extracted {len(actual_result['files'])} files from final state")
-                        print(f"[DEBUG] File names: {list(files_data.keys())[:5]}...")  # Show first 5 file names
+                        print(f"[DEBUG] File names: {list(islice(files_data, 5))}...")  # Show first 5 file names
                     else:
                         print(f"[DEBUG] ⚠️ files_data is not a dict, got: {files_data}")
                     
@@ -1558,7 +1558,7 @@ async def test_agent_generation_end_to_end_success(
                 if isinstance(files_data, dict):
                     actual_result["files"] = files_data
                     print(f"[DEBUG] ✅ Successfully extracted {len(actual_result['files'])} files from final state")
-                    print(f"[DEBUG] File names: {list(files_data.keys())[:5]}...")  # Show first 5 file names
+                    print(f"[DEBUG] File names: {list(islice(files_data, 5))}...")  # Show first 5 file names
                 else:
                     print(f"[DEBUG] ⚠️ files_data is not a dict, got: {files_data}")
                 
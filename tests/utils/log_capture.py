@@ -21,41 +21,83 @@ Usage:
 
 import logging
 import sys
+import time
 from contextlib import contextmanager
 from datetime import datetime
+from logging.handlers import MemoryHandler
 from pathlib import Path
-from typing import Generator, TextIO
+from typing import Generator, Set, TextIO
 
 import structlog
 
+from .test_config import TestConfig
 from .test_helpers import get_output_dir
 
+# Prefer orjson for rendering structlog events (one dumps per record);
+# fall back to the stdlib when it is not installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Write buffer for the captured log file (bytes)
+LOG_FILE_BUFFER_SIZE = 65536
+
+# Separator line framing the capture header and footer
+_SEPARATOR = "=" * 80
+
+# Log files currently written by an active LogCapture
+_active_log_files: Set[Path] = set()
+
+
+def _orjson_dumps(obj: dict, default=None, **kwargs) -> str:
+    """
+    JSONRenderer serializer backed by orjson.
+    
+    Output decodes to the same value as the json.dumps path, but is compact
+    (no spaces after ',' and ':'), so lines differ byte-for-byte.
+    """
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 class TeeStream:
     """
     Stream that writes to both original stream (console) and log file.
     
     This allows us to capture all stdout/stderr while still showing output
-    in the console for real-time monitoring.
+    in the console for real-time monitoring. The console is flushed once per
+    completed line (by the stream itself when it is line-buffered); the log
+    file relies on its own buffer and is only flushed every
+    ``flush_interval`` seconds (immediately when it is 0).
     """
     
-    def __init__(self, original_stream: TextIO, log_file: TextIO):
+    def __init__(self, original_stream: TextIO, log_file: TextIO, flush_interval: float = 1.0):
         self.original_stream = original_stream
         self.log_file = log_file
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        # A line-buffered console (e.g. a TTY) already flushes on newlines
+        self._flush_console_lines = not getattr(original_stream, "line_buffering", False)
         
     def write(self, text: str) -> None:
         """Write text to both original stream and log file."""
-        # Write to original stream (console)
+        # Write to original stream (console), flushing on line boundaries
         self.original_stream.write(text)
-        self.original_stream.flush()
-        # Also write to log file
+        if self._flush_console_lines and "\n" in text:
+            self.original_stream.flush()
+        # Also write to log file, flushing at most once per interval
         self.log_file.write(text)
-        self.log_file.flush()
+        now = time.monotonic()
+        if now - self._last_flush >= self.flush_interval:
+            self.log_file.flush()
+            self._last_flush = now
         
     def flush(self) -> None:
         """Flush both streams."""
         self.original_stream.flush()
         self.log_file.flush()
+        self._last_flush = time.monotonic()
 
 
 @contextmanager
@@ -79,10 +121,18 @@ def LogCapture(test_name: str = "test") -> Generator[Path, None, None]:
             # log_file contains path to the captured logs
     """
     # Generate unique log filename
-    log_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    started_at = datetime.now()
+    log_timestamp = started_at.strftime("%Y%m%d_%H%M%S")
     log_filename = f"{test_name}_{log_timestamp}.log"
     log_filepath = get_output_dir() / log_filename
     
+    # A nested capture into the same file (same test name within the same
+    # second) is a no-op: the outer capture already records everything, and
+    # reopening the file would truncate it and add a second writer
+    if log_filepath in _active_log_files:
+        yield log_filepath
+        return
+    
     # Store original state
     original_stdout = sys.stdout
     original_stderr = sys.stderr
@@ -90,19 +140,23 @@ def LogCapture(test_name: str = "test") -> Generator[Path, None, None]:
     original_level = root_logger.level
     original_handlers = root_logger.handlers.copy()
     
-    # Open log file
-    log_file = open(log_filepath, 'w')
+    # Open log file with a large buffer; TeeStream flushes it periodically
+    log_file = open(log_filepath, 'w', buffering=LOG_FILE_BUFFER_SIZE)
+    _active_log_files.add(log_filepath)
+    memory_handler = None
     
     try:
         print(f"\n[LOG_CAPTURE] All logs will be saved to: {log_filepath}")
-        print("=" * 80)
+        print(_SEPARATOR)
         
         # ================================================================
         # SETUP PYTHON LOGGING CAPTURE
         # ================================================================
         
-        # Create file handler for all logs
-        file_handler = logging.FileHandler(log_filepath, mode='a')
+        # Write log records through the same open log file the tee'd
+        # stdout/stderr use, so the file has a single writer (a second
+        # handle would write at its own offset and clobber tee'd output)
+        file_handler = logging.StreamHandler(log_file)
         file_handler.setLevel(logging.DEBUG)
         
         # Create detailed formatter
@@ -111,9 +165,18 @@ def LogCapture(test_name: str = "test") -> Generator[Path, None, None]:
         )
         file_handler.setFormatter(formatter)
         
+        # Buffer records in memory and write them out in batches; anything
+        # at WARNING or above is written out immediately
+        memory_handler = MemoryHandler(
+            capacity=TestConfig.get_log_capture_buffer(),
+            flushLevel=logging.WARNING,
+            target=file_handler,
+            flushOnClose=True
+        )
+        
         # Configure root logger to capture all library logs
         root_logger.setLevel(logging.DEBUG)
-        root_logger.addHandler(file_handler)
+        root_logger.addHandler(memory_handler)
         
         # ================================================================
         # SETUP STRUCTLOG CAPTURE (used by the application)
@@ -129,7 +192,8 @@ def LogCapture(test_name: str = "test") -> Generator[Path, None, None]:
                 structlog.processors.StackInfoRenderer(),
                 structlog.processors.format_exc_info,
                 structlog.processors.UnicodeDecoder(),
-                structlog.processors.JSONRenderer()
+                structlog.processors.JSONRenderer(serializer=_orjson_dumps)
+                if ORJSON_AVAILABLE else structlog.processors.JSONRenderer()
             ],
             context_class=dict,
             logger_factory=structlog.stdlib.LoggerFactory(),
@@ -141,15 +205,18 @@ def LogCapture(test_name: str = "test") -> Generator[Path, None, None]:
         # SETUP STDOUT/STDERR CAPTURE
         # ================================================================
         
-        # Redirect stdout and stderr to capture all print statements
+        # Redirect stdout and stderr to capture all print statements;
+        # stderr output is flushed to the log file immediately
         sys.stdout = TeeStream(original_stdout, log_file)
-        sys.stderr = TeeStream(original_stderr, log_file)
+        sys.stderr = TeeStream(original_stderr, log_file, flush_interval=0)
         
         # Write initial log header
-        log_file.write(f"\n{'=' * 80}\n")
-        log_file.write(f"LOG CAPTURE STARTED: {datetime.now().isoformat()}\n")
-        log_file.write(f"Test: {test_name}\n")
-        log_file.write(f"{'=' * 80}\n\n")
+        log_file.write(
+            f"\n{_SEPARATOR}\n"
+            f"LOG CAPTURE STARTED: {started_at.isoformat()}\n"
+            f"Test: {test_name}\n"
+            f"{_SEPARATOR}\n\n"
+        )
         log_file.flush()
         
         # Yield the log file path to the caller
@@ -160,10 +227,16 @@ def LogCapture(test_name: str = "test") -> Generator[Path, None, None]:
         # CLEANUP AND RESTORE ORIGINAL STATE
         # ================================================================
         
+        # Write out buffered records ahead of the footer
+        if memory_handler is not None:
+            memory_handler.close()
+        
         # Write final log footer
-        log_file.write(f"\n{'=' * 80}\n")
-        log_file.write(f"LOG CAPTURE ENDED: {datetime.now().isoformat()}\n")
-        log_file.write(f"{'=' * 80}\n")
+        log_file.write(
+            f"\n{_SEPARATOR}\n"
+            f"LOG CAPTURE ENDED: {datetime.now().isoformat()}\n"
+            f"{_SEPARATOR}\n"
+        )
         
         # Restore stdout/stderr
         sys.stdout = original_stdout
@@ -175,6 +248,7 @@ def LogCapture(test_name: str = "test") -> Generator[Path, None, None]:
         
         # Close log file
         log_file.close()
+        _active_log_files.discard(log_filepath)
         
         print(f"[LOG_CAPTURE] Logs saved to: {log_filepath}")
 
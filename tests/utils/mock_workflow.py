@@ -5,19 +5,43 @@ This module provides LLM mocking by replaying real events from a successful work
 ensuring 100% fidelity to actual execution while being fast and deterministic.
 """
 
+import functools
 import json
 import os
 import asyncio
 import threading
 import time
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Tuple
 from unittest.mock import Mock
 
+from .test_config import TestConfig
+
 # Global state for event replay
 _replay_active = False
 _replay_thread = None
 
+# job_id of the workflow run the events were captured from; replaced with the
+# current test's job_id when the events are replayed
+_CAPTURED_JOB_ID = b"test-job-63e8fa1b-60cb-454b-8815-96f1b4cb4574"
+
+
+@functools.lru_cache(maxsize=4)
+def _load_events_cached(events_file: Path) -> Tuple[Tuple[Dict[str, Any], ...], Tuple[Tuple[bytes, ...], ...]]:
+    """
+    Parse a captured events file and serialize each event, once per file.
+    
+    Each serialized event is split around the captured job_id, so a replay
+    only has to join the fragments with its own job_id. Every EventReplayMock
+    (one per test and per MockWorkflowCoordinator) shares the result instead
+    of re-reading the file. Errors are not cached.
+    """
+    with open(events_file, 'rb') as f:
+        events = tuple(json.load(f))
+    return events, tuple(
+        tuple(json.dumps(event).encode().split(_CAPTURED_JOB_ID)) for event in events
+    )
+
 
 class EventReplayMock:
     """Replays real workflow events to simulate LLM execution."""
@@ -25,23 +49,34 @@ class EventReplayMock:
     def __init__(self, events_file: str = "all_events.json"):
         """Initialize with events from a successful workflow run."""
         self.events_file = Path(__file__).parent.parent / "mock" / events_file
-        self.events = self._load_events()
+        # Events are serialized once up front; replay only substitutes the job_id
+        self.events, self.payload_fragments = self._load_events()
         self.redis_client = None
         self.job_id = None
         
-    def _load_events(self) -> List[Dict[str, Any]]:
-        """Load events from the captured workflow file."""
+    def _load_events(self) -> Tuple[Tuple[Dict[str, Any], ...], Tuple[Tuple[bytes, ...], ...]]:
+        """Load events and their serialized payload fragments from the captured workflow file."""
         try:
-            with open(self.events_file) as f:
-                events = json.load(f)
+            events, payload_fragments = _load_events_cached(self.events_file)
             print(f"[MOCK] Loaded {len(events)} events from {self.events_file}")
-            return events
+            return events, payload_fragments
         except FileNotFoundError:
             print(f"[MOCK] WARNING: Events file not found: {self.events_file}")
-            return []
+            return (), ()
         except json.JSONDecodeError as e:
             print(f"[MOCK] ERROR: Invalid JSON in events file: {e}")
-            return []
+            return (), ()
+    
+    def _payload_batches(self, job_id: str):
+        """Yield the replay payloads, rewritten for job_id, in pipeline-sized batches."""
+        job_bytes = job_id.encode()
+        batch_size = TestConfig.get_mock_replay_batch()
+        
+        for start in range(0, len(self.payload_fragments), batch_size):
+            yield [
+                job_bytes.join(fragments)
+                for fragments in self.payload_fragments[start:start + batch_size]
+            ]
     
     def start_replay(self, redis_client, job_id: str):
         """Start replaying events to Redis in a background thread."""
@@ -53,24 +88,18 @@ class EventReplayMock:
             try:
                 channel = f"langgraph:stream:{job_id}"
                 print(f"[MOCK] Starting event replay to channel: {channel}")
+                delay_s = TestConfig.get_mock_event_delay() / 1000
                 
-                for i, event in enumerate(self.events):
-                    # Update job_id in event to match current test
-                    event_str = json.dumps(event)
-                    # Replace the original job_id with current test job_id
-                    event_str = event_str.replace(
-                        "test-job-63e8fa1b-60cb-454b-8815-96f1b4cb4574", 
-                        job_id
-                    )
+                for batch in self._payload_batches(job_id):
+                    # Publish a batch of events to Redis in one round trip
+                    pipe = redis_client.pipeline(transaction=False)
+                    for payload in batch:
+                        pipe.publish(channel, payload)
+                    pipe.execute()
                     
-                    # Publish event to Redis
-                    redis_client.publish(channel, event_str)
-                    
-                    # Small delay to simulate streaming (but much faster than real)
-                    time.sleep(0.001)  # 1ms delay between events
-                    
-                    if i % 100 == 0:  # Progress update every 100 events
-                        print(f"[MOCK] Replayed {i+1}/{len(self.events)} events")
+                    # Optional pacing to simulate streaming, applied once per batch
+                    if delay_s > 0:
+                        time.sleep(delay_s * len(batch))
                 
                 # Add a small buffer after publishing all events to ensure Redis pub/sub delivery
                 time.sleep(0.1)  # 100ms buffer for Redis pub/sub processing
@@ -85,14 +114,50 @@ class EventReplayMock:
         replay_thread.start()
         
         return replay_thread
+    
+    async def replay_async(self, redis_client, job_id: str):
+        """Replay events to Redis on the running event loop with an asyncio client."""
+        self.redis_client = redis_client
+        self.job_id = job_id
+        
+        try:
+            channel = f"langgraph:stream:{job_id}"
+            print(f"[MOCK] Starting async event replay to channel: {channel}")
+            delay_s = TestConfig.get_mock_event_delay() / 1000
+            
+            for batch in self._payload_batches(job_id):
+                # Publish a batch of events to Redis in one round trip
+                async with redis_client.pipeline(transaction=False) as pipe:
+                    for payload in batch:
+                        pipe.publish(channel, payload)
+                    await pipe.execute()
+                
+                # Optional pacing to simulate streaming, applied once per batch
+                if delay_s > 0:
+                    await asyncio.sleep(delay_s * len(batch))
+            
+            # Add a small buffer after publishing all events to ensure Redis pub/sub delivery
+            await asyncio.sleep(0.1)  # 100ms buffer for Redis pub/sub processing
+            
+            print(f"[MOCK] Completed replaying {len(self.events)} events (with delivery buffer)")
+            
+        except Exception as e:
+            print(f"[MOCK] ERROR during event replay: {e}")
 
 
-def get_mock_model_with_event_replay():
+# Content of the chunks yielded by MockLLMModel.stream/astream
+_MOCK_STREAM_CHUNKS = ("Mock", " streaming", " response")
+_MOCK_ASTREAM_CHUNKS = ("Mock", " async", " response")
+_MOCK_CHUNK_METADATA = {"model": "mock-gpt-4o-mini"}
+
+
+@functools.lru_cache(maxsize=None)
+def _mock_llm_model_class():
     """
-    Create a mock LLM model that returns proper LangChain message objects.
+    Define the MockLLMModel class once.
     
-    This mock model returns valid AIMessage objects that LangChain can process,
-    while the actual workflow events are replayed separately.
+    Messages are still created per call rather than shared: LangGraph assigns
+    ids to messages in place, so a shared instance would alias across turns.
     """
     from langchain_core.messages import AIMessage
     from langchain_core.outputs import LLMResult, Generation
@@ -108,7 +173,8 @@ def get_mock_model_with_event_replay():
         
         def invoke(self, messages, **kwargs):
             """Return a proper AIMessage object."""
-            print("[MOCK] LLM invoke called - returning mock AIMessage")
+            if TestConfig.is_mock_verbose():
+                print("[MOCK] LLM invoke called - returning mock AIMessage")
             return AIMessage(
                 content="Mock LLM response - workflow events are replayed separately",
                 response_metadata={
@@ -119,29 +185,22 @@ def get_mock_model_with_event_replay():
         
         def stream(self, messages, **kwargs):
             """Return proper streaming chunks."""
-            print("[MOCK] LLM stream called - returning mock chunks")
-            chunks = [
-                AIMessage(content="Mock", response_metadata={"model": "mock-gpt-4o-mini"}),
-                AIMessage(content=" streaming", response_metadata={"model": "mock-gpt-4o-mini"}),
-                AIMessage(content=" response", response_metadata={"model": "mock-gpt-4o-mini"}),
-            ]
-            for chunk in chunks:
-                yield chunk
+            if TestConfig.is_mock_verbose():
+                print("[MOCK] LLM stream called - returning mock chunks")
+            for content in _MOCK_STREAM_CHUNKS:
+                yield AIMessage(content=content, response_metadata=_MOCK_CHUNK_METADATA)
         
         async def astream(self, messages, **kwargs):
             """Async version of stream."""
-            print("[MOCK] LLM astream called - returning mock async chunks")
-            chunks = [
-                AIMessage(content="Mock", response_metadata={"model": "mock-gpt-4o-mini"}),
-                AIMessage(content=" async", response_metadata={"model": "mock-gpt-4o-mini"}),
-                AIMessage(content=" response", response_metadata={"model": "mock-gpt-4o-mini"}),
-            ]
-            for chunk in chunks:
-                yield chunk
+            if TestConfig.is_mock_verbose():
+                print("[MOCK] LLM astream called - returning mock async chunks")
+            for content in _MOCK_ASTREAM_CHUNKS:
+                yield AIMessage(content=content, response_metadata=_MOCK_CHUNK_METADATA)
         
         async def ainvoke(self, messages, **kwargs):
             """Async version of invoke."""
-            print("[MOCK] LLM ainvoke called - returning mock AIMessage")
+            if TestConfig.is_mock_verbose():
+                print("[MOCK] LLM ainvoke called - returning mock AIMessage")
             return AIMessage(
                 content="Mock async LLM response - workflow events are replayed separately",
                 response_metadata={
@@ -152,7 +211,8 @@ def get_mock_model_with_event_replay():
         
         def generate(self, messages_list, **kwargs):
             """Generate method for compatibility."""
-            print("[MOCK] LLM generate called - returning mock LLMResult")
+            if TestConfig.is_mock_verbose():
+                print("[MOCK] LLM generate called - returning mock LLMResult")
             generations = []
             for messages in messages_list:
                 gen = Generation(
@@ -168,20 +228,33 @@ def get_mock_model_with_event_replay():
         
         def bind_tools(self, tools, **kwargs):
             """Bind tools to the model - return self for chaining."""
-            print(f"[MOCK] LLM bind_tools called with {len(tools) if tools else 0} tools")
+            if TestConfig.is_mock_verbose():
+                print(f"[MOCK] LLM bind_tools called with {len(tools) if tools else 0} tools")
             return self
         
         def with_structured_output(self, schema, **kwargs):
             """Structured output method for compatibility."""
-            print("[MOCK] LLM with_structured_output called")
+            if TestConfig.is_mock_verbose():
+                print("[MOCK] LLM with_structured_output called")
             return self
         
         def bind(self, **kwargs):
             """Bind method for compatibility."""
-            print("[MOCK] LLM bind called")
+            if TestConfig.is_mock_verbose():
+                print("[MOCK] LLM bind called")
             return self
     
-    return MockLLMModel()
+    return MockLLMModel
+
+
+def get_mock_model_with_event_replay():
+    """
+    Create a mock LLM model that returns proper LangChain message objects.
+    
+    This mock model returns valid AIMessage objects that LangChain can process,
+    while the actual workflow events are replayed separately.
+    """
+    return _mock_llm_model_class()()
 
 
 def setup_mock_event_replay(redis_client, job_id: str):
@@ -252,12 +325,23 @@ class MockWorkflowCoordinator:
         self.job_id = job_id
         self.replay_mock = EventReplayMock()
         self.replay_thread = None
+        self.replay_task = None
     
     async def start_workflow_simulation(self):
         """Start the mock workflow simulation."""
         print(f"[MOCK] Starting workflow simulation for job_id: {self.job_id}")
         
-        # Start event replay in background
+        # Start event replay in background: as a task on this event loop for
+        # asyncio Redis clients, on a daemon thread for blocking ones
+        from redis.asyncio import Redis as AsyncRedis
+        
+        if isinstance(self.redis_client, AsyncRedis):
+            self.replay_task = asyncio.create_task(
+                self.replay_mock.replay_async(self.redis_client, self.job_id)
+            )
+            print("[MOCK] Mock workflow simulation started")
+            return self.replay_task
+        
         self.replay_thread = self.replay_mock.start_replay(self.redis_client, self.job_id)
         
         print("[MOCK] Mock workflow simulation started")
@@ -293,6 +377,27 @@ def cleanup_mock_workflow(job_id: str):
     print("[MOCK] Mock workflow cleanup completed")
 
 
+@functools.lru_cache(maxsize=4)
+def _load_checkpoint_rows_cached(checkpoints_file: Path) -> Tuple[Tuple[str, str, str], ...]:
+    """
+    Load the mock checkpoints file once and pre-serialize the rows to insert.
+    
+    Returns (checkpoint_id, checkpoint JSON, metadata JSON) for the first 3
+    checkpoints; handle_mock_execution only prepends the job_id.
+    """
+    with open(checkpoints_file) as f:
+        mock_checkpoints = json.load(f)
+    
+    return tuple(
+        (
+            checkpoint_data["checkpoint_id"],
+            json.dumps(checkpoint_data["checkpoint"]),
+            json.dumps(checkpoint_data["metadata"])
+        )
+        for checkpoint_data in mock_checkpoints[:3]  # Use first 3 checkpoints
+    )
+
+
 def handle_mock_execution(execution_manager, job_id: str, trace_id: str, agent_definition: dict):
     """
     Handle mock execution by creating mock checkpoints and returning mock result.
@@ -317,39 +422,28 @@ def handle_mock_execution(execution_manager, job_id: str, trace_id: str, agent_d
         # Use the provided execution manager directly
         if execution_manager and execution_manager.checkpointer:
             try:
-                # Load mock checkpoints from the test data file
-                import json
-                from pathlib import Path
-                
                 checkpoints_file = Path(__file__).parent.parent / "mock" / "checkpoints.json"
                 if checkpoints_file.exists():
-                    with open(checkpoints_file) as f:
-                        mock_checkpoints = json.load(f)
+                    # Create a few mock checkpoints with the current job_id as thread_id
+                    rows = [
+                        (job_id, checkpoint_id, checkpoint, metadata)
+                        for checkpoint_id, checkpoint, metadata in _load_checkpoint_rows_cached(checkpoints_file)
+                    ]
+                    
+                    # Insert directly into PostgreSQL using raw SQL (simpler than LangGraph API),
+                    # all rows over a single connection
+                    import psycopg
+                    conn_str = execution_manager.postgres_connection_string
                     
-                    # Create a few mock checkpoints with the current job_id
-                    for i, checkpoint_data in enumerate(mock_checkpoints[:3]):  # Use first 3 checkpoints
-                        # Update the checkpoint to use current job_id as thread_id
-                        checkpoint_copy = checkpoint_data.copy()
-                        checkpoint_copy["thread_id"] = job_id
-                        
-                        # Insert directly into PostgreSQL using raw SQL (simpler than LangGraph API)
-                        import psycopg
-                        conn_str = execution_manager.postgres_connection_string
-                        
-                        with psycopg.connect(conn_str) as conn:
-                            with conn.cursor() as cur:
-                                cur.execute("""
-                                    INSERT INTO checkpoints (thread_id, checkpoint_id, checkpoint, metadata)
-                                    VALUES (%s, %s, %s, %s)
-                                """, (
-                                    job_id,
-                                    checkpoint_copy["checkpoint_id"],
-                                    json.dumps(checkpoint_copy["checkpoint"]),
-                                    json.dumps(checkpoint_copy["metadata"])
-                                ))
-                            conn.commit()
+                    with psycopg.connect(conn_str) as conn:
+                        with conn.cursor() as cur:
+                            cur.executemany("""
+                                INSERT INTO checkpoints (thread_id, checkpoint_id, checkpoint, metadata)
+                                VALUES (%s, %s, %s, %s)
+                            """, rows)
+                        conn.commit()
                     
-                    logger.info("mock_checkpoints_created", job_id=job_id, trace_id=trace_id, count=min(3, len(mock_checkpoints)))
+                    logger.info("mock_checkpoints_created", job_id=job_id, trace_id=trace_id, count=len(rows))
                 else:
                     logger.warning("mock_checkpoints_file_not_found", job_id=job_id, trace_id=trace_id, file=str(checkpoints_file))
                     
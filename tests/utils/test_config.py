@@ -5,12 +5,20 @@ This module provides configuration management for test execution,
 including environment-based switching between mock and real LLM modes.
 """
 
+import functools
 import os
 from typing import Dict, Any
 
 
 class TestConfig:
-    """Configuration manager for test execution."""
+    """
+    Configuration manager for test execution.
+    
+    Settings other than is_mock_mode() are read from the environment on first
+    use and cached; call reset() after changing them. The test suite does this
+    around every test (see tests/conftest.py). is_mock_mode() is read on every
+    call, since the model and execution strategy factories depend on it.
+    """
     
     @staticmethod
     def is_mock_mode() -> bool:
@@ -21,30 +29,68 @@ class TestConfig:
         return result
     
     @staticmethod
+    @functools.cache
     def get_mock_timeout() -> int:
         """Get timeout for mock mode tests (seconds)."""
         return int(os.getenv("MOCK_TIMEOUT", "30"))
     
     @staticmethod
+    @functools.cache
     def get_real_timeout() -> int:
         """Get timeout for real LLM tests (seconds)."""
         return int(os.getenv("REAL_TIMEOUT", "480"))
     
     @staticmethod
+    @functools.cache
     def get_mock_event_delay() -> int:
         """Get delay between mock events (milliseconds)."""
-        return int(os.getenv("MOCK_EVENT_DELAY", "5"))
+        return int(os.getenv("MOCK_EVENT_DELAY", "0"))
+    
+    @staticmethod
+    @functools.cache
+    def get_mock_replay_batch() -> int:
+        """Get number of mock events published per Redis pipeline."""
+        return int(os.getenv("MOCK_REPLAY_BATCH", "64"))
     
     @staticmethod
+    @functools.cache
     def get_mock_events_file() -> str:
         """Get path to mock events file."""
         return os.getenv("MOCK_EVENTS_FILE", "run_20251218_115227/all_events.json")
     
     @staticmethod
+    @functools.cache
     def should_cleanup_mock() -> bool:
         """Check if mock resources should be cleaned up after tests."""
         return os.getenv("CLEANUP_MOCK", "true").lower() == "true"
     
+    @staticmethod
+    @functools.cache
+    def is_mock_verbose() -> bool:
+        """Check if the mock LLM should print each call it receives."""
+        return os.getenv("MOCK_VERBOSE", "false").lower() == "true"
+    
+    @staticmethod
+    @functools.cache
+    def get_log_capture_buffer() -> int:
+        """Get number of log records LogCapture buffers before writing."""
+        return int(os.getenv("LOG_CAPTURE_BUFFER", "1024"))
+    
+    @classmethod
+    def reset(cls) -> None:
+        """Clear cached settings so they are re-read from the environment."""
+        for getter in (
+            cls.get_mock_timeout,
+            cls.get_real_timeout,
+            cls.get_mock_event_delay,
+            cls.get_mock_replay_batch,
+            cls.get_mock_events_file,
+            cls.should_cleanup_mock,
+            cls.is_mock_verbose,
+            cls.get_log_capture_buffer,
+        ):
+            getter.cache_clear()
+    
     @staticmethod
     def get_test_summary() -> Dict[str, Any]:
         """Get summary of current test configuration."""
@@ -53,8 +99,11 @@ class TestConfig:
             "mock_timeout": TestConfig.get_mock_timeout(),
             "real_timeout": TestConfig.get_real_timeout(),
             "mock_event_delay": TestConfig.get_mock_event_delay(),
+            "mock_replay_batch": TestConfig.get_mock_replay_batch(),
             "mock_events_file": TestConfig.get_mock_events_file(),
             "cleanup_mock": TestConfig.should_cleanup_mock(),
+            "mock_verbose": TestConfig.is_mock_verbose(),
+            "log_capture_buffer": TestConfig.get_log_capture_buffer(),
         }
 
 
@@ -76,9 +125,14 @@ ENV_VARS = {
         "example": "REAL_TIMEOUT=600"
     },
     "MOCK_EVENT_DELAY": {
-        "description": "Delay between mock events in milliseconds",
-        "default": "5",
-        "example": "MOCK_EVENT_DELAY=10"
+        "description": "Delay between mock events in milliseconds (0 replays without pacing)",
+        "default": "0",
+        "example": "MOCK_EVENT_DELAY=1"
+    },
+    "MOCK_REPLAY_BATCH": {
+        "description": "Mock events published per Redis pipeline",
+        "default": "64",
+        "example": "MOCK_REPLAY_BATCH=256"
     },
     "MOCK_EVENTS_FILE": {
         "description": "Path to captured events file for replay",
@@ -89,6 +143,16 @@ ENV_VARS = {
         "description": "Cleanup mock resources after tests (true/false)",
         "default": "true", 
         "example": "CLEANUP_MOCK=false"
+    },
+    "MOCK_VERBOSE": {
+        "description": "Print every call made to the mock LLM (true/false)",
+        "default": "false",
+        "example": "MOCK_VERBOSE=true"
+    },
+    "LOG_CAPTURE_BUFFER": {
+        "description": "Log records buffered by LogCapture before writing",
+        "default": "1024",
+        "example": "LOG_CAPTURE_BUFFER=1"
     }
 }
 
@@ -12,7 +12,9 @@ References:
     - agent-executor-minimum-events.md: Minimum guaranteed event counts
 """
 
+import functools
 import json
+import os
 import time
 from datetime import datetime
 from pathlib import Path
@@ -21,6 +23,14 @@ from typing import Any, Dict, List, Tuple
 import psycopg
 import jsonschema
 
+# Prefer orjson for parsing definitions (several times faster on nested
+# dicts); fall back to the stdlib when it is not installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # ============================================================================
 # CONSTANTS FROM agent-executor-minimum-events.md (DEEPAGENTS ARCHITECTURE)
@@ -148,8 +158,11 @@ def load_definition_with_files(definition_path: Path) -> Dict[str, Any]:
         ValueError: If definition structure is invalid
     """
     # Load the base definition
-    with open(definition_path) as f:
-        definition = json.load(f)
+    if ORJSON_AVAILABLE:
+        definition = orjson.loads(definition_path.read_bytes())
+    else:
+        with open(definition_path) as f:
+            definition = json.load(f)
     
     # Get the prompts and tools directories (siblings to definition.json)
     prompts_dir = definition_path.parent / "prompts"
@@ -527,20 +540,17 @@ def validate_workflow_result(result: Dict[str, Any], checkpoints: List[Dict[str,
     # Check 3: Validate output indicates success
     if not output:
         errors.append("No output message found in result")
-    elif "successfully" not in output.lower() and "completed" not in output.lower():
-        errors.append(f"Output does not indicate successful completion: {output[:100]}...")
+    else:
+        output_lower = output.lower()
+        if "successfully" not in output_lower and "completed" not in output_lower:
+            errors.append(f"Output does not indicate successful completion: {output[:100]}...")
     
     # Check 4: Validate workflow execution completed properly using checkpoints
-    # Only validate checkpoints in real LLM mode (mock mode creates mock checkpoints)
-    import os
-    is_mock_mode = os.getenv("USE_MOCK_LLM", "true").lower() == "true"
-    
-    if not is_mock_mode and len(checkpoints) == 0:
+    # Only validate checkpoints in real LLM mode (mock mode creates mock checkpoints).
+    # In mock mode, missing mock checkpoints are not necessarily a workflow
+    # failure - the mock setup might have issues - so they are not checked.
+    if not checkpoints and os.getenv("USE_MOCK_LLM", "true").lower() != "true":
         errors.append("No checkpoints found - graph execution may not have started")
-    elif is_mock_mode and len(checkpoints) == 0:
-        # In mock mode, we expect mock checkpoints to be created, but if they're missing
-        # it's not necessarily a workflow failure - the mock setup might have issues
-        pass  # Don't fail the test for missing mock checkpoints
     
     # Note: The actual validation of workflow success (definition.json generation, etc.)
     # should be done by examining the Redis streaming events in the test, not here.
@@ -549,6 +559,35 @@ def validate_workflow_result(result: Dict[str, Any], checkpoints: List[Dict[str,
     return len(errors) == 0, errors
 
 
+# Authoritative schema for the generated definition.json
+DEFINITION_SCHEMA_PATH = Path(__file__).parent.parent / "mock" / "schema.json"
+
+
+@functools.lru_cache(maxsize=None)
+def _definition_validator(schema_path: Path):
+    """
+    Load a JSON schema and build a validator for it, once per schema file.
+    
+    jsonschema.validate() re-checks the schema and builds a new validator on
+    every call; the cached validator is reused across validations instead.
+    """
+    with open(schema_path, 'r') as f:
+        schema = json.load(f)
+    
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
+# Artifacts the Builder Agent workflow must leave in the files state
+REQUIRED_ARTIFACTS = (
+    "/THE_SPEC/constitution.md",
+    "/THE_SPEC/plan.md",
+    "/THE_SPEC/requirements.md",
+    "/definition.json",
+)
+
+
 def validate_redis_artifacts(events: List[Dict[str, Any]], job_id: str) -> Tuple[bool, List[str]]:
     """
     Validate that required file system artifacts were generated and emitted in Redis streaming events.
@@ -594,26 +633,15 @@ def validate_redis_artifacts(events: List[Dict[str, Any]], job_id: str) -> Tuple
         errors.append("No files found in final state update event")
         return False, errors
     
-    # Define required artifacts based on the Builder Agent workflow
-    required_files = [
-        "/THE_SPEC/constitution.md",
-        "/THE_SPEC/plan.md", 
-        "/THE_SPEC/requirements.md",
-        "/definition.json"
-    ]
-    
     # Validate each required file exists in the files state
-    missing_files = []
-    for file_path in required_files:
-        if file_path not in files_state:
-            missing_files.append(file_path)
+    missing_files = [f for f in REQUIRED_ARTIFACTS if f not in files_state]
     
     if missing_files:
         errors.append(f"Missing required artifacts in Redis event files: {missing_files}")
     
     # Additional validation: Check that files have content
     empty_files = []
-    for file_path in required_files:
+    for file_path in REQUIRED_ARTIFACTS:
         if file_path in files_state:
             file_data = files_state[file_path]
             # File data structure: {"content": ["line1", "line2", ...], "created_at": "...", "modified_at": "..."}
@@ -632,14 +660,10 @@ def validate_redis_artifacts(events: List[Dict[str, Any]], job_id: str) -> Tuple
     # ================================================================
     if "/definition.json" in files_state and not errors:  # Only validate if file exists and no previous errors
         try:
-            # Load the schema
-            schema_path = Path(__file__).parent.parent / "mock" / "schema.json"
+            schema_path = DEFINITION_SCHEMA_PATH
             if not schema_path.exists():
                 errors.append(f"Schema file not found: {schema_path}")
             else:
-                with open(schema_path, 'r') as f:
-                    schema = json.load(f)
-                
                 # Extract definition.json content from Redis event
                 definition_file_data = files_state["/definition.json"]
                 
@@ -663,11 +687,14 @@ def validate_redis_artifacts(events: List[Dict[str, Any]], job_id: str) -> Tuple
                 
                 # Validate against schema
                 try:
-                    jsonschema.validate(instance=definition_json, schema=schema)
-                except jsonschema.ValidationError as e:
-                    errors.append(f"definition.json schema validation failed: {e.message}")
+                    validator = _definition_validator(schema_path)
                 except jsonschema.SchemaError as e:
                     errors.append(f"Invalid schema file: {e.message}")
+                else:
+                    # best_match picks the same error jsonschema.validate() would raise
+                    error = jsonschema.exceptions.best_match(validator.iter_errors(definition_json))
+                    if error is not None:
+                        errors.append(f"definition.json schema validation failed: {error.message}")
                     
         except Exception as e:
             errors.append(f"Unexpected error during schema validation: {e}")
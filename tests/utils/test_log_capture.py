@@ -0,0 +1,100 @@
+"""
+Test the LogCapture context manager.
+"""
+
+import json
+import logging
+import sys
+from datetime import datetime
+
+import pytest
+
+from tests.utils import log_capture
+from tests.utils.log_capture import LogCapture
+from tests.utils.test_config import TestConfig
+
+
+def test_log_capture_writes_each_record_once():
+    """Test that every log record and print lands in the log file exactly once."""
+    logger = logging.getLogger("tests.log_capture")
+    
+    with LogCapture("log_capture_check") as log_filepath:
+        for i in range(50):
+            logger.info("record %d", i)
+            print(f"printed {i}")
+    
+    try:
+        lines = log_filepath.read_text().splitlines()
+        assert sum(" - tests.log_capture - INFO - record " in line for line in lines) == 50
+        assert sum(line.startswith("printed ") for line in lines) == 50
+        assert lines[-2].startswith("LOG CAPTURE ENDED")
+    finally:
+        log_filepath.unlink()
+
+
+def test_nested_log_capture_into_same_file_adds_no_writer(monkeypatch):
+    """Test that a nested LogCapture into the same file reuses the outer capture."""
+    # Freeze the clock so both captures resolve to the same file name
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2025, 1, 1, 12, 0, 0)
+    
+    monkeypatch.setattr(log_capture, "datetime", FrozenDatetime)
+    logger = logging.getLogger("tests.log_capture")
+    root_logger = logging.getLogger()
+    
+    with LogCapture("log_capture_nested") as outer_filepath:
+        outer_handlers = list(root_logger.handlers)
+        outer_stdout = sys.stdout
+        print("before nested capture")
+        
+        with LogCapture("log_capture_nested") as inner_filepath:
+            assert inner_filepath == outer_filepath
+            assert root_logger.handlers == outer_handlers
+            assert sys.stdout is outer_stdout
+            for i in range(20):
+                logger.info("record %d", i)
+        
+        print("after nested capture")
+    
+    try:
+        lines = outer_filepath.read_text().splitlines()
+        assert sum(" - tests.log_capture - INFO - record " in line for line in lines) == 20
+        assert "before nested capture" in lines
+        assert "after nested capture" in lines
+    finally:
+        outer_filepath.unlink()
+
+
+def test_log_capture_setup_error_is_not_masked(monkeypatch):
+    """Test that an error while setting up the capture propagates unchanged."""
+    monkeypatch.setenv("LOG_CAPTURE_BUFFER", "abc")
+    TestConfig.reset()
+    original_stdout = sys.stdout
+    
+    try:
+        with pytest.raises(ValueError, match="abc"):
+            with LogCapture("log_capture_bad_buffer"):
+                pass
+        assert sys.stdout is original_stdout
+    finally:
+        for log_filepath in log_capture.get_output_dir().glob("log_capture_bad_buffer_*.log"):
+            log_filepath.unlink()
+
+
+@pytest.mark.skipif(not log_capture.ORJSON_AVAILABLE, reason="orjson not installed")
+def test_orjson_dumps_decodes_like_stdlib():
+    """Test that the orjson serializer encodes the same value as json.dumps."""
+    event = {
+        "event": "job_started",
+        "job_id": "job-1",
+        "attempt": 2,
+        3: "int key",
+        "tags": ["a", "b"],
+        "extra": {"nested": None, "ok": True},
+    }
+    
+    rendered = log_capture._orjson_dumps(event, default=repr)
+    
+    assert json.loads(rendered) == json.loads(json.dumps(event, default=repr))
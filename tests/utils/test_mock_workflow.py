@@ -0,0 +1,64 @@
+"""
+Test the mock workflow event replay.
+"""
+
+import json
+
+from tests.utils.mock_workflow import EventReplayMock, _CAPTURED_JOB_ID
+
+
+class FakeAsyncPipeline:
+    """Records publishes and hands them to the owning client on execute()."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def publish(self, channel, payload):
+        self.commands.append((channel, payload))
+
+    async def execute(self):
+        self.client.batches.append(self.commands)
+        self.commands = []
+
+
+class FakeAsyncRedis:
+    """Minimal asyncio Redis client exposing the pipeline API replay_async uses."""
+
+    def __init__(self):
+        self.batches = []
+
+    def pipeline(self, transaction=True):
+        return FakeAsyncPipeline(self)
+
+
+async def test_replay_async_publishes_events_in_order(monkeypatch):
+    """Test that every event is published once, in order, rewritten for the job_id."""
+    monkeypatch.setenv("MOCK_EVENT_DELAY", "0")
+    monkeypatch.setenv("MOCK_REPLAY_BATCH", "2")
+
+    events = [
+        {"event_type": "on_llm_stream", "job_id": _CAPTURED_JOB_ID.decode(), "seq": i}
+        for i in range(5)
+    ]
+    replay_mock = EventReplayMock()
+    replay_mock.events = tuple(events)
+    replay_mock.payload_fragments = tuple(
+        tuple(json.dumps(event).encode().split(_CAPTURED_JOB_ID)) for event in events
+    )
+    redis_client = FakeAsyncRedis()
+
+    await replay_mock.replay_async(redis_client, "job-replay-check")
+
+    assert [len(batch) for batch in redis_client.batches] == [2, 2, 1]
+    published = [command for batch in redis_client.batches for command in batch]
+    assert {channel for channel, _ in published} == {"langgraph:stream:job-replay-check"}
+    assert [json.loads(payload) for _, payload in published] == [
+        {**event, "job_id": "job-replay-check"} for event in events
+    ]